@@ -1,69 +1,126 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+from flask_caching import Cache
 from concurrent.futures import ThreadPoolExecutor
-import re
+import os
+
+import numpy as np
+import orjson
+from scipy.optimize import linear_sum_assignment
 
 # Import the new seller-based scrapers
-from seller import scrape_amazon_seller, scrape_flipkart_seller, clean_price
+from seller import scrape_amazon_seller, scrape_flipkart_seller
 
 app = Flask(__name__)
 
+# In-process cache; switch CACHE_TYPE to 'RedisCache' when running several workers
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+
+# Shared across requests so scraper threads are reused instead of spawned per search.
+# Each search occupies two workers, so this allows SCRAPER_WORKERS // 2 concurrent
+# searches; every worker may also keep a headless Chrome resident (see seller.py).
+SCRAPER_WORKERS = int(os.environ.get('SCRAPER_WORKERS', 16))
+executor = ThreadPoolExecutor(max_workers=SCRAPER_WORKERS, thread_name_prefix='scraper')
+
 # --- Utility Functions ---
-def get_keywords(name):
-    """Extracts significant keywords from a product name for comparison."""
-    return set(re.findall(r'\b\w+\b', name.lower()))
+def encode_keywords(keyword_sets, vocab):
+    """Flattens keyword sets into parallel (row, token index) arrays, growing the vocabulary as needed."""
+    sizes = np.fromiter((len(keywords) for keywords in keyword_sets), dtype=np.intp, count=len(keyword_sets))
+    rows = np.repeat(np.arange(len(keyword_sets)), sizes)
+    tokens = np.fromiter(
+        (vocab.setdefault(token, len(vocab)) for keywords in keyword_sets for token in keywords),
+        dtype=np.intp, count=len(rows),
+    )
+    return rows, tokens
+
+
+def similarity_matrix(amazon_keywords, flipkart_keywords):
+    """Computes the pairwise Jaccard similarity between two lists of keyword sets."""
+    vocab = {}
+    amazon_rows, amazon_tokens = encode_keywords(amazon_keywords, vocab)
+    flipkart_rows, flipkart_tokens = encode_keywords(flipkart_keywords, vocab)
+
+    amazon_matrix = np.zeros((len(amazon_keywords), len(vocab)))
+    amazon_matrix[amazon_rows, amazon_tokens] = 1
+    flipkart_matrix = np.zeros((len(flipkart_keywords), len(vocab)))
+    flipkart_matrix[flipkart_rows, flipkart_tokens] = 1
+
+    intersection = amazon_matrix @ flipkart_matrix.T
+    union = amazon_matrix.sum(axis=1, keepdims=True) + flipkart_matrix.sum(axis=1) - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def priced_items(products):
+    """Pairs each product with its numeric price, dropping products without one."""
+    return [(item, item._price_f) for item in products if item._price_f != float('inf')]
 
 
 def compare_products(amazon_list, flipkart_list):
     """
     Compares Amazon and Flipkart products based on name similarity.
+    Pairs are chosen by an optimal assignment over the similarity matrix.
     Determines which platform offers the best deal.
     """
     comparisons = []
-    flipkart_list_copy = list(flipkart_list)
-
-    for amazon_item in amazon_list:
-        best_match = None
-        highest_similarity = 0.0
-        amazon_keywords = get_keywords(amazon_item['name'])
-
-        # Find the best matching product from Flipkart
-        for flipkart_item in flipkart_list_copy:
-            flipkart_keywords = get_keywords(flipkart_item['name'])
-            intersection = len(amazon_keywords.intersection(flipkart_keywords))
-            union = len(amazon_keywords.union(flipkart_keywords))
-            similarity = intersection / union if union > 0 else 0
-
-            if similarity > highest_similarity:
-                highest_similarity = similarity
-                best_match = flipkart_item
-
-        # Only compare if at least 20% keyword overlap
-        if best_match and highest_similarity > 0.2:
-            amazon_price = clean_price(amazon_item.get('price', 'N/A'))
-            flipkart_price = clean_price(best_match.get('price', 'N/A'))
-
-            if amazon_price != float('inf') and flipkart_price != float('inf'):
-                if amazon_price < flipkart_price:
-                    best_deal = 'Amazon'
-                elif flipkart_price < amazon_price:
-                    best_deal = 'Flipkart'
-                else:
-                    best_deal = 'Both have the same price'
-
-                comparisons.append({
-                    'amazon_product': amazon_item,
-                    'flipkart_product': best_match,
-                    'price_difference': f"₹{abs(amazon_price - flipkart_price):,.2f}",
-                    'best_deal': best_deal,
-                })
-
-                # Remove matched Flipkart item to avoid duplicates
-                flipkart_list_copy.remove(best_match)
+    # Unpriced products can never be compared, so keep them out of the assignment
+    amazon_priced = priced_items(amazon_list)
+    flipkart_priced = priced_items(flipkart_list)
+    if not amazon_priced or not flipkart_priced:
+        return comparisons
+
+    similarity = similarity_matrix(
+        [item._kw for item, _ in amazon_priced],
+        [item._kw for item, _ in flipkart_priced],
+    )
+
+    # Only pairs with at least 20% keyword overlap are candidates; others cost nothing
+    candidates = similarity > 0.2
+    best_cols = similarity.argmax(axis=1)
+    rows = np.flatnonzero(candidates[np.arange(len(best_cols)), best_cols])
+    cols = best_cols[rows]
+
+    # If no two products want the same best match, every row already has its
+    # highest possible similarity and the assignment solve cannot improve on it
+    if len(np.unique(cols)) < len(cols):
+        # Products with no candidate above the threshold can't be matched, so
+        # solve only the sub-problem spanned by rows and columns that have one
+        candidate_rows = np.flatnonzero(candidates.any(axis=1))
+        candidate_cols = np.flatnonzero(candidates.any(axis=0))
+        sub_similarity = similarity[np.ix_(candidate_rows, candidate_cols)]
+        sub_rows, sub_cols = linear_sum_assignment(np.where(sub_similarity > 0.2, -sub_similarity, 0.0))
+        rows, cols = candidate_rows[sub_rows], candidate_cols[sub_cols]
+
+    for row, col in zip(rows, cols):
+        if similarity[row, col] <= 0.2:
+            continue
+        amazon_item, amazon_price = amazon_priced[row]
+        flipkart_item, flipkart_price = flipkart_priced[col]
+
+        if amazon_price < flipkart_price:
+            best_deal = 'Amazon'
+        elif flipkart_price < amazon_price:
+            best_deal = 'Flipkart'
+        else:
+            best_deal = 'Both have the same price'
+
+        comparisons.append({
+            'amazon_product': amazon_item,
+            'flipkart_product': flipkart_item,
+            'price_difference': f"₹{abs(amazon_price - flipkart_price):,.2f}",
+            'best_deal': best_deal,
+        })
 
     print(f"Found {len(comparisons)} matching product pairs for comparison.")
     return comparisons
 
 
+def found_products(response):
+    """Cache only searches that returned products, so a failed scrape isn't pinned for the timeout."""
+    if not isinstance(response, Response) or response.status_code != 200:
+        return False
+    results = orjson.loads(response.get_data())
+    return bool(results['amazon'] or results['flipkart'])
+
+
 # --- Flask Routes ---
 @app.route('/')
 def index():
@@ -72,6 +129,7 @@ def index():
 
 
 @app.route('/search')
+@cache.cached(query_string=True, response_filter=found_products)
 def search():
     """
     Handles a product search request.
@@ -84,26 +142,27 @@ def search():
 
     print(f"🔍 Starting concurrent search for: {product_name}")
 
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        amazon_future = executor.submit(scrape_amazon_seller, product_name)
-        flipkart_future = executor.submit(scrape_flipkart_seller, product_name)
-        amazon_results = amazon_future.result()
-        flipkart_results = flipkart_future.result()
+    amazon_future = executor.submit(scrape_amazon_seller, product_name)
+    flipkart_future = executor.submit(scrape_flipkart_seller, product_name)
 
-    comparison_results = compare_products(amazon_results, flipkart_results)
+    # Remove duplicate URLs up front so the comparison only sees unique entries
+    amazon_results = list({p.product_url: p for p in amazon_future.result()}.values())
+    flipkart_results = list({p.product_url: p for p in flipkart_future.result()}.values())
 
-    # Remove duplicate URLs to ensure unique entries
-    unique_amazon = list({p['product_url']: p for p in amazon_results if 'product_url' in p}.values())
-    unique_flipkart = list({p['product_url']: p for p in flipkart_results if 'product_url' in p}.values())
+    comparison_results = compare_products(amazon_results, flipkart_results)
 
     final_results = {
-        "amazon": unique_amazon,
-        "flipkart": unique_flipkart,
-        "comparisons": comparison_results
+        "amazon": [p.to_dict() for p in amazon_results],
+        "flipkart": [p.to_dict() for p in flipkart_results],
+        "comparisons": [
+            {**c, 'amazon_product': c['amazon_product'].to_dict(),
+             'flipkart_product': c['flipkart_product'].to_dict()}
+            for c in comparison_results
+        ]
     }
 
     print("✅ Search complete. Returning results.")
-    return jsonify(final_results)
+    return app.response_class(orjson.dumps(final_results), mimetype='application/json')
 
 
 # --- Main Entry Point ---
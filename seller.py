@@ -4,21 +4,33 @@ seller.py
 Responsible for scraping detailed product data including seller information
 from Amazon and Flipkart.
 
-Uses Selenium + BeautifulSoup with multiple fallback selectors to ensure
-robustness against layout changes.
+Fetches listing pages over plain HTTP and parses them with selectolax,
+falling back to a headless Selenium browser when the static HTML has no
+product cards. Fallback selectors, combined into one compound selector per
+field, keep parsing robust against layout changes.
+
+Fallback browsers are cached per scraper thread and live until the process
+exits, so a server can keep one headless Chrome (a few hundred MB each)
+resident per worker in app.py's SCRAPER_WORKERS pool.
 """
 
-import time
+import atexit
 import re
+import string
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import httpx
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 
 
 # --- CSS Selectors Configuration ---
@@ -39,6 +51,56 @@ FLIPKART_SELECTORS = {
     "link": ['._1fQZEK', 'a._2UzuFa'],
 }
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+)
+
+# Each fallback list joined into one selector; selectolax returns matches in
+# selector order, so the first listed selector still takes priority
+AMAZON_COMPOUND = {key: ", ".join(selectors) for key, selectors in AMAZON_SELECTORS.items()}
+FLIPKART_COMPOUND = {key: ", ".join(selectors) for key, selectors in FLIPKART_SELECTORS.items()}
+
+_WORD_RE = re.compile(r'\w+')
+_PRICE_STRIP = str.maketrans('', '', '₹,' + string.ascii_letters)
+
+# Shared so connections are pooled across searches
+_http_client = httpx.Client(headers={"User-Agent": USER_AGENT}, timeout=10, follow_redirects=True)
+
+# One browser per scraper thread, kept alive between searches
+_driver_local = threading.local()
+_drivers = []
+_drivers_lock = threading.Lock()
+
+
+# --- Data Model ---
+@dataclass(slots=True)
+class Product:
+    """A scraped search result, with its keywords and numeric price precomputed."""
+    name: str
+    price: str
+    seller: str
+    image_url: str
+    product_url: str
+    source: str
+    _kw: frozenset = field(init=False, repr=False, compare=False)
+    _price_f: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._kw = get_keywords(self.name)
+        self._price_f = clean_price(self.price)
+
+    def to_dict(self):
+        """Returns the public fields as a plain dict for the JSON response."""
+        return {
+            'name': self.name,
+            'price': self.price,
+            'seller': self.seller,
+            'image_url': self.image_url,
+            'product_url': self.product_url,
+            'source': self.source,
+        }
+
 
 # --- Helper Functions ---
 def get_driver():
@@ -48,25 +110,128 @@ def get_driver():
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
-    )
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     service = Service(ChromeDriverManager().install())
     return webdriver.Chrome(service=service, options=chrome_options)
 
 
-def find_with_fallbacks(element, selectors):
-    """Tries multiple selectors, returns the first matching element."""
-    for selector in selectors:
+def get_thread_driver():
+    """Returns this thread's cached WebDriver, starting one on first use."""
+    driver = getattr(_driver_local, 'driver', None)
+    if driver is None:
+        driver = get_driver()
+        if not driver:
+            return None
+        _driver_local.driver = driver
+        with _drivers_lock:
+            _drivers.append(driver)
+    return driver
+
+
+def release_driver(driver):
+    """Clears session state so the driver can serve the next search, discarding it if it died."""
+    try:
+        # delete_all_cookies() only covers the loaded site; a thread's browser
+        # serves both Amazon and Flipkart, so clear every domain's cookies
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except WebDriverException:
+        _driver_local.driver = None
+        with _drivers_lock:
+            _drivers.remove(driver)
         try:
-            found = element.select_one(selector)
-            if found:
-                return found
-        except Exception:
-            continue
-    return None
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+@atexit.register
+def quit_drivers():
+    """Shuts down every cached WebDriver when the process exits."""
+    with _drivers_lock:
+        drivers = list(_drivers)
+        _drivers.clear()
+    for driver in drivers:
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+def get_keywords(name):
+    """Extracts significant keywords from a product name for comparison."""
+    return frozenset(_WORD_RE.findall(name.lower()))
+
+
+def fetch_page(url):
+    """Fetches a page over plain HTTP, returning its HTML or None on failure."""
+    try:
+        response = _http_client.get(url)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    return response.text
+
+
+# --- Page Parsers ---
+def parse_amazon_results(page_source):
+    """Extracts product details from an Amazon search results page."""
+    tree = HTMLParser(page_source)
+    product_cards = tree.css(AMAZON_COMPOUND["product_card"])
+    results = []
+
+    for card in product_cards:
+        name_el = card.css_first(AMAZON_COMPOUND["name"])
+        price_el = card.css_first(AMAZON_COMPOUND["price"])
+        seller_el = card.css_first(AMAZON_COMPOUND["seller"])
+        image_el = card.css_first(AMAZON_COMPOUND["image"])
+        link_el = card.css_first(AMAZON_COMPOUND["link"])
+
+        name = name_el.text(strip=True) if name_el else "N/A"
+        price = f"₹{price_el.text(strip=True)}" if price_el else "N/A"
+        seller = seller_el.text(strip=True).replace('Sold by ', '') if seller_el and 'Sold by' in seller_el.text() else "Amazon"
+        image_url = image_el.attributes.get('src') if image_el else "N/A"
+        product_url = "https://www.amazon.in" + link_el.attributes['href'] if link_el and link_el.attributes.get('href') else "N/A"
+
+        if name != "N/A" and product_url != "N/A":
+            results.append(Product(
+                name=name,
+                price=price,
+                seller=seller,
+                image_url=image_url,
+                product_url=product_url,
+                source='Amazon',
+            ))
+    return results
+
+
+def parse_flipkart_results(page_source):
+    """Extracts product details from a Flipkart search results page."""
+    tree = HTMLParser(page_source)
+    product_cards = tree.css(FLIPKART_COMPOUND["product_card"])
+    results = []
+
+    for card in product_cards:
+        name_el = card.css_first(FLIPKART_COMPOUND["name"])
+        price_el = card.css_first(FLIPKART_COMPOUND["price"])
+        image_el = card.css_first(FLIPKART_COMPOUND["image"])
+        link_el = card.css_first(FLIPKART_COMPOUND["link"])
+
+        name = name_el.text(strip=True) if name_el else "N/A"
+        price = f"₹{price_el.text(strip=True)}" if price_el else "N/A"
+        image_url = image_el.attributes.get('src') if image_el else "N/A"
+        product_url = "https://www.flipkart.com" + link_el.attributes['href'] if link_el and link_el.attributes.get('href') else "N/A"
+
+        if name != "N/A" and product_url != "N/A":
+            results.append(Product(
+                name=name,
+                price=price,
+                seller="Flipkart",
+                image_url=image_url,
+                product_url=product_url,
+                source='Flipkart',
+            ))
+    return results
 
 
 # --- Core Scraper Functions ---
@@ -74,7 +239,15 @@ def scrape_amazon_seller(product_name):
     """Scrapes Amazon for product details including seller name."""
     search_query = product_name.replace(' ', '+')
     url = f"https://www.amazon.in/s?k={search_query}"
-    driver = get_driver()
+
+    # Static HTML is usually enough; only start a browser when it is not
+    page_source = fetch_page(url)
+    if page_source:
+        results = parse_amazon_results(page_source)
+        if results:
+            return results
+
+    driver = get_thread_driver()
     if not driver:
         return []
 
@@ -83,91 +256,49 @@ def scrape_amazon_seller(product_name):
         WebDriverWait(driver, 15).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, AMAZON_SELECTORS["product_card"][0]))
         )
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        product_cards = soup.select(AMAZON_SELECTORS["product_card"][0])
-        results = []
-
-        for card in product_cards:
-            name_el = find_with_fallbacks(card, AMAZON_SELECTORS["name"])
-            price_el = find_with_fallbacks(card, AMAZON_SELECTORS["price"])
-            seller_el = find_with_fallbacks(card, AMAZON_SELECTORS["seller"])
-            image_el = find_with_fallbacks(card, AMAZON_SELECTORS["image"])
-            link_el = find_with_fallbacks(card, AMAZON_SELECTORS["link"])
-
-            name = name_el.get_text(strip=True) if name_el else "N/A"
-            price = f"₹{price_el.get_text(strip=True)}" if price_el else "N/A"
-            seller = seller_el.get_text(strip=True).replace('Sold by ', '') if seller_el and 'Sold by' in seller_el.get_text() else "Amazon"
-            image_url = image_el.get('src') if image_el else "N/A"
-            product_url = "https://www.amazon.in" + link_el['href'] if link_el and link_el.has_attr('href') else "N/A"
-
-            if name != "N/A" and product_url != "N/A":
-                results.append({
-                    'name': name,
-                    'price': price,
-                    'seller': seller,
-                    'image_url': image_url,
-                    'product_url': product_url,
-                    'source': 'Amazon'
-                })
-        return results
+        return parse_amazon_results(driver.page_source)
     except (TimeoutException, NoSuchElementException):
         driver.save_screenshot('amazon_error.png')
         return []
     finally:
-        driver.quit()
+        release_driver(driver)
 
 
 def scrape_flipkart_seller(product_name):
     """Scrapes Flipkart for product details."""
     search_query = product_name.replace(' ', '%20')
     url = f"https://www.flipkart.com/search?q={search_query}"
-    driver = get_driver()
+
+    # Static HTML is usually enough; only start a browser when it is not
+    page_source = fetch_page(url)
+    if page_source:
+        results = parse_flipkart_results(page_source)
+        if results:
+            return results
+
+    driver = get_thread_driver()
     if not driver:
         return []
 
     try:
         driver.get(url)
-        time.sleep(10)
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        product_cards = []
-
-        for selector in FLIPKART_SELECTORS["product_card"]:
-            product_cards.extend(soup.select(selector))
-
-        results = []
-        for card in product_cards:
-            name_el = find_with_fallbacks(card, FLIPKART_SELECTORS["name"])
-            price_el = find_with_fallbacks(card, FLIPKART_SELECTORS["price"])
-            image_el = find_with_fallbacks(card, FLIPKART_SELECTORS["image"])
-            link_el = find_with_fallbacks(card, FLIPKART_SELECTORS["link"])
-
-            name = name_el.get_text(strip=True) if name_el else "N/A"
-            price = f"₹{price_el.get_text(strip=True)}" if price_el else "N/A"
-            image_url = image_el.get('src') if image_el else "N/A"
-            product_url = "https://www.flipkart.com" + link_el['href'] if link_el and link_el.has_attr('href') else "N/A"
-
-            if name != "N/A" and product_url != "N/A":
-                results.append({
-                    'name': name,
-                    'price': price,
-                    'seller': "Flipkart",
-                    'image_url': image_url,
-                    'product_url': product_url,
-                    'source': 'Flipkart'
-                })
-        return results
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, FLIPKART_COMPOUND["product_card"]))
+        )
+        return parse_flipkart_results(driver.page_source)
     except (TimeoutException, NoSuchElementException):
         driver.save_screenshot('flipkart_error.png')
         return []
     finally:
-        driver.quit()
+        release_driver(driver)
 
 
+@lru_cache(maxsize=4096)
 def clean_price(price_str):
     """Converts a price string to a float."""
     if not isinstance(price_str, str) or price_str == "N/A":
         return float('inf')
-    cleaned_price = re.sub(r'[₹,A-Za-z]', '', price_str).strip()
+    cleaned_price = price_str.translate(_PRICE_STRIP).strip()
     try:
         return float(cleaned_price)
     except (ValueError, TypeError):
@@ -0,0 +1,148 @@
+"""
+Unit Tests for app.py
+Mapped to Test Plan v2.0 (Quad Function STP)
+---------------------------------------------------------
+Requirement Coverage:
+ COMP-01, COMP-02, COMP-03 : Product matching and price comparison
+"""
+
+import random
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from seller import Product
+from app import app, cache, compare_products, encode_keywords, priced_items, similarity_matrix
+
+
+# --- Utility: Build products without scraping ---
+def amazon(name, price="₹100", url=None):
+    return Product(name, price, "Amazon", "N/A", url or f"amazon/{name}", "Amazon")
+
+
+def flipkart(name, price="₹100", url=None):
+    return Product(name, price, "Flipkart", "N/A", url or f"flipkart/{name}", "Flipkart")
+
+
+def matched_pairs(comparisons):
+    return [(c['amazon_product'].product_url, c['flipkart_product'].product_url) for c in comparisons]
+
+
+# --- COMP-02: Keyword Similarity ---
+def test_encode_keywords_shares_vocabulary():
+    vocab = {}
+    rows, tokens = encode_keywords([frozenset({'a'}), frozenset(), frozenset({'b'})], vocab)
+    assert rows.tolist() == [0, 2]
+    assert tokens.tolist() == [vocab['a'], vocab['b']]
+
+    rows, tokens = encode_keywords([frozenset({'b', 'c'})], vocab)
+    assert sorted(tokens.tolist()) == [vocab['b'], vocab['c']]
+    assert len(vocab) == 3
+
+
+def test_similarity_matrix_jaccard_values():
+    similarity = similarity_matrix(
+        [frozenset({'a', 'b'}), frozenset({'a', 'b', 'c', 'd'}), frozenset()],
+        [frozenset({'a', 'b'}), frozenset({'b', 'c'}), frozenset()],
+    )
+    assert similarity.tolist() == [
+        [1.0, 1 / 3, 0.0],
+        [0.5, 0.5, 0.0],
+        [0.0, 0.0, 0.0],  # empty sets hit the union == 0 path
+    ]
+
+
+# --- COMP-01: Optimal Matching ---
+def test_compare_products_prefers_optimal_assignment():
+    """Greedy would give p q r s t the p q r listing and leave p q r u unmatched."""
+    amazon_list = [amazon("p q r s t", url="a1"), amazon("p q r u", url="a2")]
+    flipkart_list = [flipkart("p q r", url="f1"), flipkart("s t", url="f2")]
+    assert matched_pairs(compare_products(amazon_list, flipkart_list)) == [("a1", "f2"), ("a2", "f1")]
+
+
+def test_compare_products_pruned_solve_maps_indices(monkeypatch):
+    """Rows and columns without a candidate are dropped from the solve but indices map back."""
+    solves = []
+    monkeypatch.setattr("app.linear_sum_assignment", lambda cost: solves.append(cost) or linear_sum_assignment(cost))
+    amazon_list = [amazon("zzz", url="a0"), amazon("p q r s t", url="a1"), amazon("p q r u", url="a2")]
+    flipkart_list = [flipkart("yyy", url="f0"), flipkart("p q r", url="f1"), flipkart("s t", url="f2")]
+    assert matched_pairs(compare_products(amazon_list, flipkart_list)) == [("a1", "f2"), ("a2", "f1")]
+    assert [cost.shape for cost in solves] == [(2, 2)]
+
+
+def test_compare_products_threshold():
+    """Pairs need strictly more than 20% keyword overlap."""
+    assert compare_products([amazon("a b c")], [flipkart("a d e")]) == []
+    assert matched_pairs(compare_products([amazon("a b", url="a1")], [flipkart("a c", url="f1")])) == [("a1", "f1")]
+
+
+def test_compare_products_matches_full_assignment(monkeypatch):
+    """The no-collision shortcut and pruned solve must reach the same total as a full solve."""
+    solves = []
+    monkeypatch.setattr("app.linear_sum_assignment", lambda cost: solves.append(cost) or linear_sum_assignment(cost))
+    rng = random.Random(0)
+    words = [f"w{i}" for i in range(20)]
+
+    def random_products(make, count):
+        return [make(" ".join(rng.sample(words, rng.randint(1, 6))), url=f"{i}") for i in range(count)]
+
+    for _ in range(500):
+        amazon_list = random_products(amazon, rng.randint(1, 10))
+        flipkart_list = random_products(flipkart, rng.randint(1, 10))
+        similarity = similarity_matrix([p._kw for p in amazon_list], [p._kw for p in flipkart_list])
+
+        rows, cols = linear_sum_assignment(np.where(similarity > 0.2, -similarity, 0.0))
+        expected = sum(similarity[r, c] for r, c in zip(rows, cols) if similarity[r, c] > 0.2)
+
+        pairs = matched_pairs(compare_products(amazon_list, flipkart_list))
+        assert len({f for _, f in pairs}) == len(pairs)
+        assert sum(similarity[int(a), int(f)] for a, f in pairs) == pytest.approx(expected)
+
+    # Both the shortcut and the solve path must have been exercised
+    assert 0 < len(solves) < 500
+
+
+# --- COMP-03: Price Comparison ---
+def test_compare_products_best_deal():
+    comparisons = compare_products([amazon("iphone 15", "₹79,999")], [flipkart("iphone 15", "₹77,999")])
+    assert comparisons[0]['best_deal'] == 'Flipkart'
+    assert comparisons[0]['price_difference'] == '₹2,000.00'
+
+
+def test_priced_items_drops_unpriced():
+    priced = amazon("iphone 15", "₹79,999")
+    assert priced_items([priced, amazon("iphone 15 pro", "N/A")]) == [(priced, 79999.0)]
+
+
+def test_unpriced_product_does_not_take_a_match():
+    """An unpriced exact match must not consume the Flipkart listing."""
+    amazon_list = [amazon("iphone 15", "N/A", url="a1"), amazon("iphone 15 black", url="a2")]
+    assert matched_pairs(compare_products(amazon_list, [flipkart("iphone 15", url="f1")])) == [("a2", "f1")]
+
+
+def test_compare_products_empty_lists():
+    assert compare_products([], [flipkart("iphone 15")]) == []
+    assert compare_products([amazon("iphone 15")], []) == []
+    assert compare_products([amazon("iphone 15", "N/A")], [flipkart("iphone 15")]) == []
+
+
+# --- NFR-01: Response Caching ---
+def search_calls(monkeypatch, amazon_results):
+    """Runs the same search twice and returns how many times the Amazon scraper ran."""
+    calls = []
+    cache.clear()
+    monkeypatch.setattr("app.scrape_amazon_seller", lambda q: calls.append(q) or amazon_results)
+    monkeypatch.setattr("app.scrape_flipkart_seller", lambda q: [])
+    client = app.test_client()
+    for _ in range(2):
+        assert client.get('/search?product_name=iphone').status_code == 200
+    return len(calls)
+
+
+def test_search_caches_results(monkeypatch):
+    assert search_calls(monkeypatch, [amazon("iphone 15")]) == 1
+
+
+def test_search_does_not_cache_empty_results(monkeypatch):
+    assert search_calls(monkeypatch, []) == 2
@@ -9,15 +9,17 @@ Requirement Coverage:
 """
 
 import pytest
+import threading
 import types
-from seller import clean_price, scrape_amazon_seller, scrape_flipkart_seller
+from seller import Product, clean_price, scrape_amazon_seller, scrape_flipkart_seller
 
 
-# --- Utility: Mock WebDriver and BeautifulSoup for offline testing ---
+# --- Utility: Mock WebDriver and HTML parser for offline testing ---
 class MockDriver:
     def __init__(self):
         self.page_source = "<html></html>"
         self.last_url = None
+        self.cdp_commands = []
 
     def get(self, url):
         self.last_url = url
@@ -25,6 +27,9 @@ class MockDriver:
     def quit(self):
         pass
 
+    def execute_cdp_cmd(self, cmd, args):
+        self.cdp_commands.append(cmd)
+
     # ✅ Added this method to satisfy WebDriverWait
     def find_element(self, *args, **kwargs):
         """Mock method to simulate element lookup."""
@@ -34,8 +39,11 @@ class MockDriver:
 @pytest.fixture
 def mock_selenium(monkeypatch):
     """Mock Selenium driver setup to avoid live scraping."""
+    monkeypatch.setattr("seller.fetch_page", lambda url: None)
+    monkeypatch.setattr("seller._driver_local", threading.local())
+    monkeypatch.setattr("seller._drivers", [])
     monkeypatch.setattr("seller.get_driver", lambda: MockDriver())
-    monkeypatch.setattr("seller.BeautifulSoup", lambda *a, **kw: types.SimpleNamespace(select=lambda s: []))
+    monkeypatch.setattr("seller.HTMLParser", lambda *a, **kw: types.SimpleNamespace(css=lambda s: []))
     return True
 
 
@@ -58,7 +66,7 @@ def test_scrape_amazon_seller_structure(mock_selenium):
     result = scrape_amazon_seller("iphone")
     assert isinstance(result, list)
     if result:
-        assert all(isinstance(p, dict) for p in result)
+        assert all(isinstance(p, Product) for p in result)
 
 
 def test_scrape_flipkart_seller_structure(mock_selenium):
@@ -66,7 +74,53 @@ def test_scrape_flipkart_seller_structure(mock_selenium):
     result = scrape_flipkart_seller("iphone")
     assert isinstance(result, list)
     if result:
-        assert all(isinstance(p, dict) for p in result)
+        assert all(isinstance(p, Product) for p in result)
+
+
+# --- NFR-01: Static HTML Fetch Skips the Browser ---
+AMAZON_PAGE = """
+<div data-component-type="s-search-result">
+  <span class="a-text-normal">iPhone 15</span>
+  <span class="a-price-whole">79,999</span>
+  <img class="s-image" src="http://image.jpg">
+  <a class="a-link-normal" href="/dp/iphone15">link</a>
+</div>
+"""
+
+
+def test_scrape_amazon_seller_static_html(monkeypatch):
+    """Amazon results parsed from plain HTTP must not start a browser."""
+    def no_driver():
+        raise AssertionError("browser should not be started")
+
+    monkeypatch.setattr("seller.fetch_page", lambda url: AMAZON_PAGE)
+    monkeypatch.setattr("seller.get_driver", no_driver)
+    result = scrape_amazon_seller("iphone")
+    assert result == [Product(
+        name='iPhone 15',
+        price='₹79,999',
+        seller='Amazon',
+        image_url='http://image.jpg',
+        product_url='https://www.amazon.in/dp/iphone15',
+        source='Amazon',
+    )]
+
+
+# --- NFR-07: Browser Reuse Across Searches ---
+def test_driver_reused_between_searches(mock_selenium, monkeypatch):
+    """The fallback browser is started once per thread, not once per search."""
+    started = []
+
+    def counting_driver():
+        started.append(MockDriver())
+        return started[-1]
+
+    monkeypatch.setattr("seller.get_driver", counting_driver)
+    scrape_amazon_seller("iphone")
+    scrape_flipkart_seller("pixel")
+    assert len(started) == 1
+    # Cookies for every site are cleared, not just the one last loaded
+    assert started[0].cdp_commands == ['Network.clearBrowserCookies'] * 2
 
 
 # --- NFR-01: Stability Under Mocked Environment ---
@@ -84,13 +138,20 @@ def test_scraper_resilience(mock_selenium):
 # --- COMP-03 / Data Integrity ---
 def test_output_keys_structure(mock_selenium):
     """Ensures output dictionaries contain required fields."""
-    sample = [{
-        'name': 'iPhone 15',
-        'price': '₹79,999',
-        'seller': 'Amazon',
-        'image_url': 'http://image.jpg',
-        'product_url': 'http://amazon.in/p/iphone',
-        'source': 'Amazon'
-    }]
+    sample = [Product(
+        name='iPhone 15',
+        price='₹79,999',
+        seller='Amazon',
+        image_url='http://image.jpg',
+        product_url='http://amazon.in/p/iphone',
+        source='Amazon'
+    ).to_dict()]
     required_keys = {'name', 'price', 'seller', 'image_url', 'product_url', 'source'}
-    assert required_keys.issubset(sample[0].keys())
+    assert required_keys == set(sample[0].keys())
+
+
+def test_product_precomputed_fields():
+    """Keywords and numeric price are derived once when a Product is built."""
+    product = Product('Apple iPhone 15', '₹79,999', 'Amazon', 'N/A', 'http://amazon.in/p/iphone', 'Amazon')
+    assert product._kw == frozenset({'apple', 'iphone', '15'})
+    assert product._price_f == 79999.0